@@ -531,6 +531,10 @@ def create_tables(db_file=DB_FILE):
         )
     """)
 
+    # Indexes for the match read paths: season listings and per-match detail lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_season ON Match(season_year, match_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_shots_match ON MatchShots(match_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_match_event_match ON MatchEvent(match_id, minute)")
 
     conn.commit()
     conn.close()
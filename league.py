@@ -9,6 +9,13 @@ from coach import Coach
 from transfer import TransferMarket
 from league_db import create_league, get_league, update_league, delete_league
 
+# Standings column, points and form letter for a side's result (+1 win, 0 draw, -1 loss)
+_RESULT_UPDATES = {
+    1: ("won", 3, "W"),
+    0: ("drawn", 1, "D"),
+    -1: ("lost", 0, "L"),
+}
+
 class League:
     def __init__(self, name, num_teams=20):
         self.name = name
@@ -310,29 +317,14 @@ class League:
         self.standings[away.name]["ga"] += home_goals
         self.standings[away.name]["gd"] = self.standings[away.name]["gf"] - self.standings[away.name]["ga"]
         
-        # Update points and form
-        if home_goals > away_goals:
-            self.standings[home.name]["won"] += 1
-            self.standings[home.name]["points"] += 3
-            self.standings[away.name]["lost"] += 1
-            # Update form
-            self.standings[home.name]["recent_form"].append("W")
-            self.standings[away.name]["recent_form"].append("L")
-        elif home_goals < away_goals:
-            self.standings[away.name]["won"] += 1
-            self.standings[away.name]["points"] += 3
-            self.standings[home.name]["lost"] += 1
-            # Update form
-            self.standings[away.name]["recent_form"].append("W")
-            self.standings[home.name]["recent_form"].append("L")
-        else:
-            self.standings[home.name]["drawn"] += 1
-            self.standings[home.name]["points"] += 1
-            self.standings[away.name]["drawn"] += 1
-            self.standings[away.name]["points"] += 1
-            # Update form
-            self.standings[home.name]["recent_form"].append("D")
-            self.standings[away.name]["recent_form"].append("D")
+        # Update points and form: +1 home win, 0 draw, -1 away win (the away side sees the negation)
+        outcome = (home_goals > away_goals) - (home_goals < away_goals)
+        for team, side_outcome in ((home, outcome), (away, -outcome)):
+            column, points, form = _RESULT_UPDATES[side_outcome]
+            stats = self.standings[team.name]
+            stats[column] += 1
+            stats["points"] += points
+            stats["recent_form"].append(form)
         
         # Keep only last 5 form results
         for team in [home, away]:
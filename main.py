@@ -9,7 +9,7 @@ from player import FootballPlayer
 from manager import Manager
 from transfer import TransferMarket
 from db_setup import initialize_fresh_database
-from match_db import save_match_to_db
+from match_db import save_match_to_db, get_db_connection
 
 def initialize_database():
     """Initialize the database with fresh start - clear all data"""
@@ -269,109 +269,113 @@ def simulate_season_with_transfers(premier_league, transfer_market):
     
     # Generate schedule and play first half of season
     premier_league.generate_schedule()
+    # One connection for every match save this season (each save still commits)
+    match_conn = get_db_connection()
+    try:
+        # Play matches until January
+        matches_played = 0
+        total_matches = len(premier_league.schedule)
+        january_start = total_matches // 2
     
-    # Play matches until January
-    matches_played = 0
-    total_matches = len(premier_league.schedule)
-    january_start = total_matches // 2
-    
-    print(f"\nPlaying first half of season ({january_start} matches)...")
-    # Compute scheduling helpers
-    for i in range(january_start):
-        match = premier_league.schedule[i]
-        match_result = premier_league.play_match(match[0], match[1])
-        # Assign scheduled date consistent with League.play_season
-        season_start = datetime(premier_league.season_year, 8, 1)
-        matches_per_week = max(1, len(premier_league.teams) // 2)
-        matchday = i // matches_per_week
-        scheduled_date = season_start + timedelta(days=7 * matchday)
-        if match_result is not None:
-            match_result['date'] = scheduled_date.isoformat()
-        save_match_to_db(match_result, premier_league.season_year, i + 1)
-        matches_played += 1
-        
-        # Process weekly finances for teams
-        if matches_played % 2 == 0:  # Every 2 matches = roughly 1 week
-            for team in premier_league.teams:
-                # Calculate matchday revenue
-                if match_result:
-                    home_team = match[0]
-                    away_team = match[1]
+        print(f"\nPlaying first half of season ({january_start} matches)...")
+        # Compute scheduling helpers
+        for i in range(january_start):
+            match = premier_league.schedule[i]
+            match_result = premier_league.play_match(match[0], match[1])
+            # Assign scheduled date consistent with League.play_season
+            season_start = datetime(premier_league.season_year, 8, 1)
+            matches_per_week = max(1, len(premier_league.teams) // 2)
+            matchday = i // matches_per_week
+            scheduled_date = season_start + timedelta(days=7 * matchday)
+            if match_result is not None:
+                match_result['date'] = scheduled_date.isoformat()
+            save_match_to_db(match_result, premier_league.season_year, i + 1, conn=match_conn)
+            matches_played += 1
+        
+            # Process weekly finances for teams
+            if matches_played % 2 == 0:  # Every 2 matches = roughly 1 week
+                for team in premier_league.teams:
+                    # Calculate matchday revenue
+                    if match_result:
+                        home_team = match[0]
+                        away_team = match[1]
                     
-                    if team == home_team:
-                        attendance_factor = 1.0 if match_result['score'][0] >= match_result['score'][1] else 0.9
-                        team.calculate_matchday_revenue(attendance_factor)
+                        if team == home_team:
+                            attendance_factor = 1.0 if match_result['score'][0] >= match_result['score'][1] else 0.9
+                            team.calculate_matchday_revenue(attendance_factor)
                     
-                team.process_weekly_finances()
-        
-        # Age players and apply decline
-        if matches_played % 10 == 0:  # Every 10 matches
-            for team in premier_league.teams:
-                # Manager scouts for talent
-                if team.manager:
-                    team.manager.scout_for_talent(premier_league.teams, transfer_market)
+                    team.process_weekly_finances()
+        
+            # Age players and apply decline
+            if matches_played % 10 == 0:  # Every 10 matches
+                for team in premier_league.teams:
+                    # Manager scouts for talent
+                    if team.manager:
+                        team.manager.scout_for_talent(premier_league.teams, transfer_market)
 
-                # Check and reinforce squad if necessary
-                team.check_and_reinforce_squad(transfer_market)
+                    # Check and reinforce squad if necessary
+                    team.check_and_reinforce_squad(transfer_market)
                 
-                for player in team.players + team.youth_academy:
-                    if random.random() < 0.02:  # 2% chance per period
-                        player.apply_age_decline()
+                    for player in team.players + team.youth_academy:
+                        if random.random() < 0.02:  # 2% chance per period
+                            player.apply_age_decline()
                     
-                    # Process injury recovery
-                    if hasattr(player, 'recover_from_injury'):
-                        player.recover_from_injury(7)  # 1 week recovery
+                        # Process injury recovery
+                        if hasattr(player, 'recover_from_injury'):
+                            player.recover_from_injury(7)  # 1 week recovery
     
-    # January transfer window (days 183-214)
-    print("\n=== JANUARY TRANSFER WINDOW OPEN ===")
-    transfer_market.current_day = 183
+        # January transfer window (days 183-214)
+        print("\n=== JANUARY TRANSFER WINDOW OPEN ===")
+        transfer_market.current_day = 183
     
-    for day in range(183, 215):
-        transfer_market.advance_day(premier_league.teams)
-        
-        # More active January window
-        if day % 2 == 0:
-            # AI managers act on their scouting lists
-            transfer_market.simulate_ai_transfers(premier_league.teams)
-        
-        if day % 10 == 0:
-            analysis = transfer_market.get_market_analysis()
-            print(f"Day {day}: {analysis['transfers_completed']} total transfers, "
-                  f"{analysis['total_listings']} active listings")
+        for day in range(183, 215):
+            transfer_market.advance_day(premier_league.teams)
+        
+            # More active January window
+            if day % 2 == 0:
+                # AI managers act on their scouting lists
+                transfer_market.simulate_ai_transfers(premier_league.teams)
+        
+            if day % 10 == 0:
+                analysis = transfer_market.get_market_analysis()
+                print(f"Day {day}: {analysis['transfers_completed']} total transfers, "
+                      f"{analysis['total_listings']} active listings")
     
-    print("=== JANUARY TRANSFER WINDOW CLOSED ===")
-    print_transfer_summary(transfer_market)
+        print("=== JANUARY TRANSFER WINDOW CLOSED ===")
+        print_transfer_summary(transfer_market)
     
-    # Play remaining matches
-    print(f"\nPlaying second half of season...")
-    # Compute scheduling helpers
-    for i in range(january_start, total_matches):
-        match = premier_league.schedule[i]
-        match_result = premier_league.play_match(match[0], match[1])
-        # Assign scheduled date consistent with League.play_season
-        season_start = datetime(premier_league.season_year, 8, 1)
-        matches_per_week = max(1, len(premier_league.teams) // 2)
-        matchday = i // matches_per_week
-        scheduled_date = season_start + timedelta(days=7 * matchday)
-        if match_result is not None:
-            match_result['date'] = scheduled_date.isoformat()
-        save_match_to_db(match_result, premier_league.season_year, i + 1)
-        matches_played += 1
-        
-        # Continue financial processing
-        if matches_played % 2 == 0:
-            for team in premier_league.teams:
-                if team == match[0]:  # Home team
-                    attendance_factor = 1.0 if match_result['score'][0] >= match_result['score'][1] else 0.9
-                    team.calculate_matchday_revenue(attendance_factor)
+        # Play remaining matches
+        print(f"\nPlaying second half of season...")
+        # Compute scheduling helpers
+        for i in range(january_start, total_matches):
+            match = premier_league.schedule[i]
+            match_result = premier_league.play_match(match[0], match[1])
+            # Assign scheduled date consistent with League.play_season
+            season_start = datetime(premier_league.season_year, 8, 1)
+            matches_per_week = max(1, len(premier_league.teams) // 2)
+            matchday = i // matches_per_week
+            scheduled_date = season_start + timedelta(days=7 * matchday)
+            if match_result is not None:
+                match_result['date'] = scheduled_date.isoformat()
+            save_match_to_db(match_result, premier_league.season_year, i + 1, conn=match_conn)
+            matches_played += 1
+        
+            # Continue financial processing
+            if matches_played % 2 == 0:
+                for team in premier_league.teams:
+                    if team == match[0]:  # Home team
+                        attendance_factor = 1.0 if match_result['score'][0] >= match_result['score'][1] else 0.9
+                        team.calculate_matchday_revenue(attendance_factor)
                 
-                team.process_weekly_finances()
+                    team.process_weekly_finances()
 
-        if matches_played % 10 == 0:
-             for team in premier_league.teams:
-                # Manager scouts for talent
-                if team.manager:
-                    team.manager.scout_for_talent(premier_league.teams, transfer_market)
+            if matches_played % 10 == 0:
+                 for team in premier_league.teams:
+                    # Manager scouts for talent
+                    if team.manager:
+                        team.manager.scout_for_talent(premier_league.teams, transfer_market)
+    finally:
+        match_conn.close()
     
     # Process contract expiries at end of season
     expired_contracts = transfer_market.process_contract_expiries(premier_league.teams)
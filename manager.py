@@ -2,11 +2,41 @@ import random
 import numpy as np
 import names
 from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Tuple, Any
 from manager_profile import ManagerProfile
 from manager_brain import ManagerBrain, StateEncoder
 from manager_db import create_manager, get_manager, update_manager, delete_manager
 
+
+@lru_cache(maxsize=None)
+def _formation_positions(formation: str) -> Tuple[str, ...]:
+    """Parse a formation string into its position slots; only a handful of formations exist."""
+    positions = ["GK"]  # Always need a goalkeeper
+    parts = formation.split("-")
+    
+    # Map formation numbers to position types
+    def_positions = ["CB", "LB", "RB", "SW"]  # Defensive positions
+    mid_positions = ["CM", "CDM", "CAM", "LM", "RM"]  # Midfield positions
+    fwd_positions = ["ST", "CF", "LW", "RW"]  # Forward positions
+    
+    # Add defenders
+    num_defenders = int(parts[0])
+    for i in range(num_defenders):
+        positions.append(def_positions[i % len(def_positions)])
+        
+    # Add midfielders
+    num_midfielders = int(parts[1])
+    for i in range(num_midfielders):
+        positions.append(mid_positions[i % len(mid_positions)])
+        
+    # Add forwards
+    num_forwards = int(parts[2])
+    for i in range(num_forwards):
+        positions.append(fwd_positions[i % len(fwd_positions)])
+        
+    return tuple(positions)
+
 class Manager:
     def __init__(self, name=None, experience_level=None, profile=None,
                  youth_promotion_ability_threshold=65, youth_promotion_age_threshold=19):
@@ -1157,30 +1187,8 @@ class Manager:
             
     def get_positions_for_formation(self, formation: str) -> List[str]:
         """Convert formation string to list of positions."""
-        positions = ["GK"]  # Always need a goalkeeper
-        parts = formation.split("-")
-        
-        # Map formation numbers to position types
-        def_positions = ["CB", "LB", "RB", "SW"]  # Defensive positions
-        mid_positions = ["CM", "CDM", "CAM", "LM", "RM"]  # Midfield positions
-        fwd_positions = ["ST", "CF", "LW", "RW"]  # Forward positions
-        
-        # Add defenders
-        num_defenders = int(parts[0])
-        for i in range(num_defenders):
-            positions.append(def_positions[i % len(def_positions)])
-            
-        # Add midfielders
-        num_midfielders = int(parts[1])
-        for i in range(num_midfielders):
-            positions.append(mid_positions[i % len(mid_positions)])
-            
-        # Add forwards
-        num_forwards = int(parts[2])
-        for i in range(num_forwards):
-            positions.append(fwd_positions[i % len(fwd_positions)])
-            
-        return positions
+        # Fresh list each call, since callers may modify it
+        return list(_formation_positions(formation))
     
     def _get_recent_performance(self):
         """Calculate recent performance metrics."""
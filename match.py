@@ -1,18 +1,80 @@
+import heapq
 import random
 import math
+import numpy as np
 from dataclasses import dataclass
-from typing import Any, List, Dict, Tuple
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import Any, List, Dict, NamedTuple, Tuple
 from match_db import save_match_to_db
 
-@dataclass
-class MatchEvent:
+# Position groups
+DEFENDERS = frozenset({"CB", "LB", "RB", "SW", "LWB", "RWB"})
+MIDFIELDERS = frozenset({"CM", "CDM", "CAM", "LM", "RM", "DM"})
+FORWARDS = frozenset({"ST", "CF", "SS", "RW", "LW"})
+
+# Preferred goalscorers, then midfielders who chip in when no striker is on the pitch
+_STRIKERS = frozenset({"ST", "CF", "SS"})
+_GOAL_MIDFIELDERS = frozenset({"CM", "CAM", "LM", "RM", "LW", "RW"})
+
+# Position group codes and out-of-position penalties [natural group][assigned group]
+_GK, _DEF, _MID, _FWD, _OTHER = range(5)
+_POSITION_GROUP = {
+    "GK": _GK,
+    **{pos: _DEF for pos in DEFENDERS},
+    **{pos: _MID for pos in MIDFIELDERS},
+    **{pos: _FWD for pos in FORWARDS}
+}
+_POSITION_PENALTY = (
+    # GK   DEF  MID  FWD  other  (assigned)
+    (0.3, 0.3, 0.3, 0.3, 0.3),  # Severe penalty for goalkeeper playing outfield
+    (0.5, 0.9, 0.7, 0.5, 0.5),  # Defenders: small penalty in defence, major up front
+    (0.7, 0.7, 0.9, 0.7, 0.7),  # Midfielders: same penalty for defence or attack
+    (0.5, 0.5, 0.7, 0.9, 0.5),  # Forwards
+    (0.7, 0.7, 0.7, 0.7, 0.7)   # Default penalty
+)
+
+def _position_penalty(natural_position, assigned_position):
+    """Performance multiplier for a player of natural_position playing assigned_position."""
+    # No penalty for playing in natural position
+    if natural_position == assigned_position:
+        return 1.0
+        
+    group = _POSITION_GROUP.get(natural_position, _OTHER)
+    assigned_group = _POSITION_GROUP.get(assigned_position, _OTHER)
+    return _POSITION_PENALTY[group][assigned_group]
+
+@lru_cache(maxsize=512)
+def _formation_suitability(natural_positions, assigned_positions):
+    """Average position suitability of a lineup; lineups repeat across a season, so memoized."""
+    if not natural_positions:
+        return 0
+    return sum(map(_position_penalty, natural_positions, assigned_positions)) / len(natural_positions)
+
+# Slots of the flattened per-player attribute tuples cached by Match._cache_attributes
+SHOT_POWER, FINISHING, GOALKEEPING, VISION, MARKING, DRIBBLING, TACKLING, AGGRESSION, OVERALL, FORM = range(10)
+
+def _shot_success_chance(shot_power, finishing, stamina_factor, form_factor, weather_mod,
+                         position_mod, goalkeeper_skill, goalkeeper_fitness, goalkeeper_form):
+    """Probability that a shot beats the goalkeeper, from plain float inputs."""
+    shot_rating = (shot_power + finishing) / 2 * stamina_factor * form_factor * weather_mod * position_mod
+    save_rating = goalkeeper_skill * goalkeeper_fitness * goalkeeper_form
+    return (shot_rating - save_rating + 50) / 150  # Normalized to 0-1 range
+
+def _tackle_success_chance(dribble_skill, att_condition, tackle_skill, def_condition):
+    """Probability that a tackle wins the ball, from plain float inputs."""
+    defence = tackle_skill * def_condition
+    return defence / (dribble_skill * att_condition + defence)
+
+class MatchEvent(NamedTuple):
     minute: int
     type: str
     player: str
     team: str
     details: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Substitution:
     minute: int
     team: str
@@ -21,6 +83,19 @@ class Substitution:
     reason: str = "tactical"
 
 class Match:
+    fatigue_factor = 0.88  # Player stamina reduction per action
+    home_advantage = 1.1  # 10% boost for home team
+    max_substitutions = 5  # Modern football allows 5 subs
+    injury_chance_ceiling = 3e-4  # Upper bound on the per-minute injury chance (~1.4e-4 worst case)
+    
+    # Updated weather effects (more balanced)
+    weather_effects = {
+        "sunny": {"passing": 1.0, "shooting": 1.0, "dribbling": 1.0},
+        "rainy": {"passing": 0.9, "shooting": 0.95, "dribbling": 0.85},
+        "windy": {"passing": 0.85, "shooting": 0.9, "dribbling": 0.95},
+        "snowy": {"passing": 0.8, "shooting": 0.85, "dribbling": 0.8}
+    }
+    
     def __init__(self, home_team, away_team):
         """
         Initialize a match between two teams.
@@ -31,6 +106,7 @@ class Match:
         """
         self.home_team = home_team
         self.away_team = away_team
+        self.teams = (home_team, away_team)  # Indexed by side: 0 home, 1 away
         self.score = [0, 0]  # [home, away]
         self.possession = [0, 0]  # Possession time in minutes
         self.shots = [0, 0]  # [home shots, away shots]
@@ -40,26 +116,31 @@ class Match:
         self.fouls = [0, 0]
         self.corners = [0, 0]
         self.offsides = [0, 0]
+        self._injury_counts = [0, 0]  # [home, away], counted in _maybe_injure_player
         self.player_stats = {}  # {player_id: {stat_name: value}}
-        self.events: List[MatchEvent] = []
+        # Events are stored column-wise; the `events` property builds MatchEvent objects on demand
+        self._event_minutes: List[int] = []
+        self._event_types: List[str] = []
+        self._event_players: List[str] = []
+        self._event_teams: List[str] = []
+        self._event_details: List[str] = []
         self.substitutions: List[Substitution] = []
         self.minute = 0
-        self.current_possession = "home"  # Who has the ball
-        self.fatigue_factor = 0.88  # Player stamina reduction per action
+        self.possession_idx = 0  # Who has the ball: 0 home, 1 away
         
         # Enhanced match attributes
-        self.home_advantage = 1.1  # 10% boost for home team
         self.intensity = random.uniform(0.8, 1.2)
         self.weather = random.choice(["sunny", "rainy", "windy", "snowy"])
+        # Bulk generator seeded from `random` so seeded simulations stay reproducible
+        self._rng = np.random.default_rng(random.getrandbits(64))
         
         # Substitution tracking
         self.home_substitutions_made = 0
         self.away_substitutions_made = 0
-        self.max_substitutions = 5  # Modern football allows 5 subs
         
         # Cards and disciplinary
-        self.home_players_sent_off = []
-        self.away_players_sent_off = []
+        self.home_players_sent_off = set()
+        self.away_players_sent_off = set()
         
         # Initialize lineups
         self.home_lineup = []
@@ -69,127 +150,98 @@ class Match:
         self.away_positions = []
         self.away_bench = []
         
-        # Updated weather effects (more balanced)
-        self.weather_effects = {
-            "sunny": {"passing": 1.0, "shooting": 1.0, "dribbling": 1.0},
-            "rainy": {"passing": 0.9, "shooting": 0.95, "dribbling": 0.85},
-            "windy": {"passing": 0.85, "shooting": 0.9, "dribbling": 0.95},
-            "snowy": {"passing": 0.8, "shooting": 0.85, "dribbling": 0.8}
-        }
+        # Players still on the pitch, bucketed by role per side [home, away]; see _refresh_position_buckets
+        self._active = [[], []]
+        self._pass_skill = [0.0, 0.0]  # Mean vision of each side's active players
+        self._pressure = [0.0, 0.0]  # Mean marking of each side's active players
+        self._attackers = [[], []]
+        self._goalkeepers = [[], []]
+        self._strikers = [[], []]
+        self._goal_midfielders = [[], []]
+        
+        # Pre-drawn in-match age decline events {minute: [(side, lineup_slot), ...]}
+        self._age_decline_schedule = {}
+        # Pre-drawn per-minute random rows, consumed by simulate_minute; see _draw_match_rolls
+        self._minute_rolls = iter(())
+        self._fatigue_rolls = iter(())
+        self._injury_rolls = iter(())
+        self._roll = None  # The row simulate_minute is currently using
+        
+        # Flattened match attributes per player {id(player): tuple indexed by SHOT_POWER, ...}
+        self._attr_cache = {}
+        # Selection availability per player {id(player): bool}, updated when a player returns to the bench
+        self._available = {}
+        
+        # Weather and intensity are fixed for the match, so bake their modifiers once
+        weather_mods = self.weather_effects[self.weather]
+        self._weather_shooting = weather_mods["shooting"]
+        self._weather_passing = weather_mods["passing"]
+        self._fatigue_min = 0.02 * self.intensity
+        self._fatigue_max = 0.05 * self.intensity
+    
+    @property
+    def current_possession(self) -> str:
+        """Side in possession, as "home" or "away"."""
+        return "away" if self.possession_idx else "home"
+    
+    @property
+    def events(self) -> List[MatchEvent]:
+        """All match events so far, in the order they happened."""
+        return list(map(MatchEvent._make, zip(
+            self._event_minutes, self._event_types, self._event_players,
+            self._event_teams, self._event_details
+        )))
+    
+    def _log_event(self, minute, event_type, player, team, details=""):
+        """Record a match event."""
+        self._event_minutes.append(minute)
+        self._event_types.append(event_type)
+        self._event_players.append(player)
+        self._event_teams.append(team)
+        self._event_details.append(details)
     
     def _calculate_position_penalty(self, player, assigned_position):
         """Calculate performance penalty for playing out of position."""
-        # Position groups
-        defenders = ["CB", "LB", "RB", "SW", "LWB", "RWB"]
-        midfielders = ["CM", "CDM", "CAM", "LM", "RM", "DM"]
-        forwards = ["ST", "CF", "SS", "LW", "RW"]
-        
-        # No penalty for playing in natural position
-        if player.position == assigned_position:
-            return 1.0
-            
-        # Calculate penalty based on position groups
-        if player.position in defenders:
-            if assigned_position in defenders:
-                return 0.9  # Small penalty for different defensive position
-            elif assigned_position in midfielders:
-                return 0.7  # Larger penalty for playing midfield
-            else:
-                return 0.5  # Major penalty for playing forward
-        elif player.position in midfielders:
-            if assigned_position in midfielders:
-                return 0.9
-            else:
-                return 0.7  # Same penalty for playing defense or forward
-        elif player.position in forwards:
-            if assigned_position in forwards:
-                return 0.9
-            elif assigned_position in midfielders:
-                return 0.7
-            else:
-                return 0.5
-        elif player.position == "GK":
-            return 0.3  # Severe penalty for goalkeeper playing outfield
-        else:
-            return 0.7  # Default penalty
+        return _position_penalty(player.position, assigned_position)
     
-    def _get_team_stats(self, team, opposition_tactics):
-        """Calculate team stats considering formations, tactics, weather, and player development."""
-        # Get lineup based on team
-        lineup = self.home_lineup if team == self.home_team else self.away_lineup
-        positions = self.home_positions if team == self.home_team else self.away_positions
-        
-        # Filter out sent off players
-        sent_off = self.home_players_sent_off if team == self.home_team else self.away_players_sent_off
-        active_lineup = [p for p in lineup if p not in sent_off]
-        
-        # Calculate average team rating from current player attributes
-        total_rating = 0
-        player_count = 0
-        for i, player in enumerate(lineup):
-            if player in sent_off:
-                continue  # Skip sent off players
-                
-            # Calculate player's current effectiveness
-            attribute_avg = sum(
-                sum(cat.values()) for cat in player.attributes.values()
-            ) / sum(len(cat) for cat in player.attributes.values())
-            
-            # Apply position penalty
-            position = positions[i] if i < len(positions) else player.position
-            position_factor = self._calculate_position_penalty(player, position)
-            
-            # Apply fitness factor
-            fitness_factor = player.stats["fitness"] / 100
-            
-            # Apply form factor
-            form_factor = player.get_form_rating()
-            
-            # Calculate final player rating
-            player_rating = attribute_avg * position_factor * fitness_factor * form_factor
-            total_rating += player_rating
-            player_count += 1
-        
-        team_rating = total_rating / player_count if player_count > 0 else 30
-        
-        # Apply home advantage
-        if team == self.home_team:
-            team_rating *= self.home_advantage
-        
-        # Apply formation bonuses
-        formation_bonus = {
-            "4-3-3": {"attack": 1.1, "defense": 0.95},
-            "4-4-2": {"attack": 1.0, "defense": 1.0},
-            "5-3-2": {"attack": 0.85, "defense": 1.15},
-            "3-5-2": {"attack": 1.05, "defense": 0.9},
-            "4-2-3-1": {"attack": 1.05, "defense": 1.05}
-        }
-        
-        # Manager's influence
-        if team.manager:
-            formation = team.manager.formation
-            formation_mod = formation_bonus.get(formation, {"attack": 1.0, "defense": 1.0})
-            tactics = team.manager.tactics
-            
-            # Tactical advantage calculation
-            if tactics["offensive"] > opposition_tactics.get("defensive", 50):
-                team_rating *= 1.05
-            if tactics["defensive"] < opposition_tactics.get("offensive", 50):
-                team_rating *= 0.98
-            
-            # Formation influence
-            team_rating *= (formation_mod["attack"] + formation_mod["defense"]) / 2
-        
-        # Weather influence (reduced impact)
-        weather_mod = sum(self.weather_effects[self.weather].values()) / 3
-        team_rating *= weather_mod
-        
-        # Penalty for being down to 10 or fewer players
-        if len(active_lineup) < 11:
-            penalty = 0.9 ** (11 - len(active_lineup))  # 10% penalty per missing player
-            team_rating *= penalty
-        
-        return team_rating
+    def _cache_attributes(self, player):
+        """Flatten the attributes and form the match engine reads into one tuple for the player."""
+        attributes = player.attributes
+        shooting = attributes["shooting"]
+        dribbling = attributes["dribbling"]
+        defending = attributes["defending"]
+        
+        self._attr_cache[id(player)] = (
+            shooting["shot_power"],
+            shooting["finishing"],
+            sum(attributes["goalkeeping"].values()) / 4,
+            attributes["passing"]["vision"],
+            defending["marking"],
+            (dribbling["ball_control"] + dribbling["agility"]) / 2,
+            (defending["standing_tackle"] + defending["sliding_tackle"]) / 2,
+            attributes.get("physical", {}).get("aggression", 50),
+            sum(sum(cat.values()) for cat in attributes.values()) / sum(len(cat) for cat in attributes.values()),
+            player.get_form_rating()  # Form only moves after the final whistle
+        )
+    
+    def _refresh_position_buckets(self, is_home):
+        """Rebuild the cached per-position player lists for one side after a lineup change."""
+        lineup = self.home_lineup if is_home else self.away_lineup
+        sent_off = self.home_players_sent_off if is_home else self.away_players_sent_off
+        side = 0 if is_home else 1
+        
+        active = [p for p in lineup if p not in sent_off]
+        self._active[side] = active
+        
+        # Team passing ability and pressing, averaged over the players still on the pitch
+        if active:
+            attr_cache = self._attr_cache
+            self._pass_skill[side] = sum(attr_cache[id(p)][VISION] for p in active) / len(active)
+            self._pressure[side] = sum(attr_cache[id(p)][MARKING] for p in active) / len(active)
+        self._attackers[side] = [p for p in active if p.position in FORWARDS]
+        self._goalkeepers[side] = [p for p in active if p.position == "GK"]
+        self._strikers[side] = [p for p in active if p.position in _STRIKERS]
+        self._goal_midfielders[side] = [p for p in active if p.position in _GOAL_MIDFIELDERS]
     
     def _calculate_card_probability(self, player, action_type, tackle_success=True):
         """Calculate probability of receiving a card based on action and player attributes"""
@@ -197,7 +249,7 @@ class Match:
         
         if action_type == "tackle":
             # Higher aggression = higher card probability
-            aggression = player.attributes.get("physical", {}).get("aggression", 50)
+            aggression = self._attr_cache[id(player)][AGGRESSION]
             base_prob = 0.02 + (aggression / 100) * 0.03
             
             # Failed tackles more likely to get cards
@@ -205,7 +257,7 @@ class Match:
                 base_prob *= 2.0
                 
         elif action_type == "foul":
-            aggression = player.attributes.get("physical", {}).get("aggression", 50)
+            aggression = self._attr_cache[id(player)][AGGRESSION]
             base_prob = 0.05 + (aggression / 100) * 0.05
             
         # Red card probability (much lower)
@@ -215,7 +267,7 @@ class Match:
     
     def _attempt_substitution(self, team, minute):
         """Attempt to make a substitution for tired or injured players"""
-        is_home = team == self.home_team
+        is_home = team is self.home_team
         lineup = self.home_lineup if is_home else self.away_lineup
         bench = self.home_bench if is_home else self.away_bench
         subs_made = self.home_substitutions_made if is_home else self.away_substitutions_made
@@ -241,15 +293,14 @@ class Match:
                 continue
                 
             # Tactical substitution for poor form
-            if player.get_form_rating() < 0.4 and minute > 60:
+            if self._attr_cache[id(player)][FORM] < 0.4 and minute > 60:
                 candidates_out.append((player, "poor_form", 0.3))
                 
         if not candidates_out:
             return False
             
         # Sort by priority and pick the most urgent
-        candidates_out.sort(key=lambda x: x[2], reverse=True)
-        player_out, reason, priority = candidates_out[0]
+        player_out, reason, priority = max(candidates_out, key=lambda x: x[2])
         
         # Only make substitution if priority is high enough or it's late in game
         if priority < 0.6 and minute < 70:
@@ -260,11 +311,11 @@ class Match:
         best_rating = 0
         
         for sub_player in bench:
-            if not sub_player.is_available_for_selection():
+            if not self._available[id(sub_player)]:
                 continue
                 
             # Calculate sub player rating for the position
-            sub_rating = sub_player.get_overall_rating()
+            sub_rating = self._attr_cache[id(sub_player)][OVERALL]
             position_factor = self._calculate_position_penalty(sub_player, player_out.position)
             fitness_factor = sub_player.stats["fitness"] / 100
             
@@ -290,6 +341,8 @@ class Match:
             lineup[lineup_index] = best_sub
             bench.remove(best_sub)
             bench.append(player_out)
+            self._available[id(player_out)] = player_out.is_available_for_selection()
+            self._refresh_position_buckets(is_home)
             
             # Update substitution count
             if is_home:
@@ -298,13 +351,13 @@ class Match:
                 self.away_substitutions_made += 1
                 
             # Add event
-            self.events.append(MatchEvent(
+            self._log_event(
                 minute,
                 "substitution",
                 best_sub.name,
                 "home" if is_home else "away",
                 f"{player_out.name} replaced by {best_sub.name} ({reason})"
-            ))
+            )
             
             return True
             
@@ -312,134 +365,108 @@ class Match:
     
     def _calculate_action_success(self, attacking_team, defending_team, action_type):
         """Calculate probability of successful action."""
-        if attacking_team == self.home_team:
+        # Per-side player lists are kept current by _refresh_position_buckets
+        if attacking_team is self.home_team:
             att_idx, def_idx = 0, 1
         else:
             att_idx, def_idx = 1, 0
             
+        r = self._roll  # This minute's pre-drawn rolls, see simulate_minute
+        
         # Get relevant player for the action
         if action_type == "shot":
-            attacking_lineup = self.home_lineup if attacking_team == self.home_team else self.away_lineup
-            defending_lineup = self.home_lineup if defending_team == self.home_team else self.away_lineup
-            
-            sent_off_att = self.home_players_sent_off if attacking_team == self.home_team else self.away_players_sent_off
-            sent_off_def = self.home_players_sent_off if defending_team == self.home_team else self.away_players_sent_off
-            
-            attackers = [p for p in attacking_lineup if p.position in ["ST", "CF", "SS", "RW", "LW"] and p not in sent_off_att]
+            attackers = self._attackers[att_idx]
             if not attackers:
                 return False
-            attacker = random.choice(attackers)
+            attacker = attackers[int(r[9] * len(attackers))]
             
             # Goalkeeper save chance
-            defenders = [p for p in defending_lineup if p.position == "GK" and p not in sent_off_def]
+            defenders = self._goalkeepers[def_idx]
             if not defenders:
                 return True
             goalkeeper = defenders[0]
             
-            shot_power = attacker.attributes["shooting"]["shot_power"]
-            finishing = attacker.attributes["shooting"]["finishing"]
-            goalkeeper_skill = sum(goalkeeper.attributes["goalkeeping"].values()) / 4
-            
-            # Consider fatigue and form
-            stamina_factor = attacker.stats["fitness"] / 100
-            form_factor = attacker.get_form_rating()
-            
-            # Calculate shot success probability
-            shot_rating = (shot_power + finishing) / 2 * stamina_factor * form_factor
-            save_rating = goalkeeper_skill * (goalkeeper.stats["fitness"] / 100) * goalkeeper.get_form_rating()
-            
-            # Weather impact on shooting
-            weather_mod = self.weather_effects[self.weather]["shooting"]
-            shot_rating *= weather_mod
-            
-            # Position penalty impact
-            shot_position_mod = self._calculate_position_penalty(attacker, "ST")
-            shot_rating *= shot_position_mod
-            
-            # Final probability calculation
-            success_chance = (shot_rating - save_rating + 50) / 150  # Normalized to 0-1 range
-            return random.random() < success_chance
+            attacker_attrs = self._attr_cache[id(attacker)]
+            goalkeeper_attrs = self._attr_cache[id(goalkeeper)]
+            success_chance = _shot_success_chance(
+                attacker_attrs[SHOT_POWER],
+                attacker_attrs[FINISHING],
+                attacker.stats["fitness"] / 100,
+                attacker_attrs[FORM],
+                self._weather_shooting,
+                _position_penalty(attacker.position, "ST"),
+                goalkeeper_attrs[GOALKEEPING],
+                goalkeeper.stats["fitness"] / 100,
+                goalkeeper_attrs[FORM]
+            )
+            return r[10] < success_chance
             
         elif action_type == "pass":
             base_chance = 0.75  # Base 75% pass success rate
             
-            attacking_lineup = self.home_lineup if attacking_team == self.home_team else self.away_lineup
-            defending_lineup = self.home_lineup if defending_team == self.home_team else self.away_lineup
-            
-            sent_off_att = self.home_players_sent_off if attacking_team == self.home_team else self.away_players_sent_off
-            sent_off_def = self.home_players_sent_off if defending_team == self.home_team else self.away_players_sent_off
-            
-            active_attackers = [p for p in attacking_lineup if p not in sent_off_att]
-            active_defenders = [p for p in defending_lineup if p not in sent_off_def]
+            active_attackers = self._active[att_idx]
+            active_defenders = self._active[def_idx]
             
             if not active_attackers or not active_defenders:
                 return base_chance > 0.5
             
             # Team passing ability vs opposition pressing
-            pass_skill = sum(p.attributes["passing"]["vision"] for p in active_attackers) / len(active_attackers)
-            defense_pressure = sum(p.attributes["defending"]["marking"] for p in active_defenders) / len(active_defenders)
+            pass_skill = self._pass_skill[att_idx]
+            defense_pressure = self._pressure[def_idx]
             
             # Weather effect
-            weather_mod = self.weather_effects[self.weather]["passing"]
-            
-            final_chance = base_chance * (pass_skill / max(1, defense_pressure)) * weather_mod
-            return random.random() < min(0.95, final_chance)
+            final_chance = base_chance * (pass_skill / max(1, defense_pressure)) * self._weather_passing
+            return r[8] < min(0.95, final_chance)
             
         elif action_type == "tackle":
-            attacking_lineup = self.home_lineup if attacking_team == self.home_team else self.away_lineup
-            defending_lineup = self.home_lineup if defending_team == self.home_team else self.away_lineup
-            
-            sent_off_att = self.home_players_sent_off if attacking_team == self.home_team else self.away_players_sent_off
-            sent_off_def = self.home_players_sent_off if defending_team == self.home_team else self.away_players_sent_off
-            
-            active_attackers = [p for p in attacking_lineup if p not in sent_off_att]
-            active_defenders = [p for p in defending_lineup if p not in sent_off_def]
+            active_attackers = self._active[att_idx]
+            active_defenders = self._active[def_idx]
             
             if not active_attackers or not active_defenders:
                 return False
                 
-            attacker = random.choice(active_attackers)
-            defender = random.choice(active_defenders)
+            attacker = active_attackers[int(r[11] * len(active_attackers))]
+            defender = active_defenders[int(r[12] * len(active_defenders))]
             
-            dribble_skill = (attacker.attributes["dribbling"]["ball_control"] + 
-                           attacker.attributes["dribbling"]["agility"]) / 2
-            tackle_skill = (defender.attributes["defending"]["standing_tackle"] + 
-                          defender.attributes["defending"]["sliding_tackle"]) / 2
+            attacker_attrs = self._attr_cache[id(attacker)]
+            defender_attrs = self._attr_cache[id(defender)]
+            dribble_skill = attacker_attrs[DRIBBLING]
+            tackle_skill = defender_attrs[TACKLING]
             
             # Fitness and form factors
-            att_condition = (attacker.stats["fitness"] / 100) * attacker.get_form_rating()
-            def_condition = (defender.stats["fitness"] / 100) * defender.get_form_rating()
+            att_condition = (attacker.stats["fitness"] / 100) * attacker_attrs[FORM]
+            def_condition = (defender.stats["fitness"] / 100) * defender_attrs[FORM]
             
-            success_chance = tackle_skill * def_condition / (dribble_skill * att_condition + tackle_skill * def_condition)
+            success_chance = _tackle_success_chance(dribble_skill, att_condition, tackle_skill, def_condition)
             
             # Check for cards if tackle fails
-            tackle_success = random.random() < success_chance
+            tackle_success = r[13] < success_chance
             if not tackle_success:
                 yellow_prob, red_prob = self._calculate_card_probability(defender, "tackle", False)
                 
-                if random.random() < red_prob:
+                if r[14] < red_prob:
                     card_result = defender.receive_card("red")
                     if card_result == "red":
                         self._send_off_player(defender, defending_team)
-                        self.events.append(MatchEvent(
+                        self._log_event(
                             self.minute, "red_card", defender.name,
-                            "home" if defending_team == self.home_team else "away",
+                            "home" if defending_team is self.home_team else "away",
                             f"{defender.name} receives a red card for a dangerous tackle!"
-                        ))
-                elif random.random() < yellow_prob:
+                        )
+                elif r[15] < yellow_prob:
                     card_result = defender.receive_card("yellow")
-                    self.events.append(MatchEvent(
+                    self._log_event(
                         self.minute, "yellow_card", defender.name,
-                        "home" if defending_team == self.home_team else "away",
+                        "home" if defending_team is self.home_team else "away",
                         f"{defender.name} receives a yellow card"
-                    ))
+                    )
                     if card_result == "red":  # Second yellow
                         self._send_off_player(defender, defending_team)
-                        self.events.append(MatchEvent(
+                        self._log_event(
                             self.minute, "red_card", defender.name,
-                            "home" if defending_team == self.home_team else "away",
+                            "home" if defending_team is self.home_team else "away",
                             f"{defender.name} sent off for second yellow card!"
-                        ))
+                        )
             
             return tackle_success
             
@@ -447,40 +474,20 @@ class Match:
     
     def _send_off_player(self, player, team):
         """Send off a player (red card)"""
-        if team == self.home_team:
-            if player not in self.home_players_sent_off:
-                self.home_players_sent_off.append(player)
+        if team is self.home_team:
+            self.home_players_sent_off.add(player)
         else:
-            if player not in self.away_players_sent_off:
-                self.away_players_sent_off.append(player)
+            self.away_players_sent_off.add(player)
+        self._refresh_position_buckets(team is self.home_team)
     
-    def _update_player_stats(self, player, action_type, success):
-        """Update player statistics based on match actions."""
-        # Fatigue calculation (reduced for realism)
-        energy_cost = {
-            "shot": 1.5,
-            "pass": 0.5,
-            "dribble": 1.0,
-            "tackle": 1.5,
-            "sprint": 2.0
-        }
-        
-        # Apply fatigue
-        base_cost = energy_cost.get(action_type, 0.8)
-        intensity_cost = base_cost * self.intensity * 0.5  # Reduced fatigue
-        player.stats["fitness"] = max(0, player.stats["fitness"] - intensity_cost)
-        
-        # Update other stats based on action success
-        if action_type == "shot" and success:
-            player.stats["goals"] += 1
-        elif action_type == "tackle":
-            if not success:
-                player.stats["fouls_committed"] += 1
-
-    def _maybe_injure_player(self, player):
-        """Randomly injure a player based on fatigue, age, and match intensity."""
+    def _maybe_injure_player(self, player, side, injury_roll):
+        """Randomly injure a player based on fatigue, age, and match intensity; side is 0 home, 1 away."""
         if player.is_injured:
             return
+        
+        # The factors below keep the chance well under this ceiling, so most rolls bail out early
+        if injury_roll >= self.injury_chance_ceiling:
+            return
             
         # Much more realistic injury rates
         base_chance = 0.00005  # Very low base chance per minute
@@ -495,7 +502,7 @@ class Match:
         
         total_chance = base_chance * (1 + fatigue_factor + age_factor + intensity_factor) * position_factor
         
-        if random.random() < total_chance:
+        if injury_roll < total_chance:
             # Determine injury severity
             severity_roll = random.random()
             if severity_roll < 0.7:
@@ -508,24 +515,52 @@ class Match:
                 injury_type = "severe"
                 
             player.apply_injury(injury_type)
+            self._injury_counts[side] += 1
             
-            self.events.append(MatchEvent(
+            self._log_event(
                 self.minute,
                 "injury",
                 player.name,
-                "home" if player in self.home_lineup else "away",
+                ("home", "away")[side],
                 f"{player.name} suffers a {injury_type} injury and may need to be substituted"
-            ))
+            )
 
+    def _draw_match_rolls(self, total_minutes):
+        """Pre-sample every minute's scalar rolls and per-slot fatigue and injury rolls up front."""
+        n_slots = len(self.home_lineup) + len(self.away_lineup)
+        self._minute_rolls = iter(self._rng.random((total_minutes, 17)).tolist())
+        self._fatigue_rolls = iter(
+            self._rng.uniform(self._fatigue_min, self._fatigue_max, (total_minutes, n_slots)).tolist()
+        )
+        self._injury_rolls = iter(self._rng.random((total_minutes, n_slots)).tolist())
+    
+    def _schedule_age_decline(self, total_minutes):
+        """Draw every lineup slot's per-minute age decline roll (0.1%) in one batch."""
+        home_slots = len(self.home_lineup)
+        rolls = self._rng.random((total_minutes, home_slots + len(self.away_lineup))) < 0.001
+        
+        self._age_decline_schedule = {}
+        for minute, slot in zip(*np.nonzero(rolls)):
+            minute, slot = int(minute), int(slot)
+            if slot < home_slots:
+                self._age_decline_schedule.setdefault(minute, []).append((0, slot))
+            else:
+                self._age_decline_schedule.setdefault(minute, []).append((1, slot - home_slots))
+    
     def simulate_minute(self):
         """Simulate one minute of the match with enhanced realism."""
+        # The minute's scalar draws, pre-sampled for the whole match in _draw_match_rolls:
+        # 0 action, 1 corner, 2 offside, 3 assist, 4 turnover, 5 foul, 6 scorer pick, 7 assister pick,
+        # 8-15 used by _calculate_action_success, 16 substitution window
+        r = self._roll = next(self._minute_rolls)
+        
         # Determine action type based on possession and game state
         action_weights = [0.25, 0.55, 0.2]  # [attack, midfield, defense]
         
         # Adjust weights based on score and time
         if self.minute > 75:
             goal_diff = self.score[0] - self.score[1]
-            if self.current_possession == "home":
+            if self.possession_idx == 0:
                 if goal_diff < 0:  # Home team behind, more attacking
                     action_weights = [0.4, 0.45, 0.15]
                 elif goal_diff > 1:  # Home team well ahead, more defensive
@@ -536,19 +571,16 @@ class Match:
                 elif goal_diff < -1:  # Away team well ahead, more defensive
                     action_weights = [0.15, 0.45, 0.4]
         
-        action = random.choices(
-            ["attack", "midfield", "defense"],
-            weights=action_weights
-        )[0]
-        
-        if self.current_possession == "home":
-            attacking_team = self.home_team
-            defending_team = self.away_team
-            score_idx = 0
+        if r[0] < action_weights[0]:
+            action = "attack"
+        elif r[0] < action_weights[0] + action_weights[1]:
+            action = "midfield"
         else:
-            attacking_team = self.away_team
-            defending_team = self.home_team
-            score_idx = 1
+            action = "defense"
+        
+        score_idx = self.possession_idx
+        attacking_team = self.teams[score_idx]
+        defending_team = self.teams[1 - score_idx]
         
         # Simulate action
         if action == "attack":
@@ -558,97 +590,91 @@ class Match:
             if pass_success:
                 self.passes_completed[score_idx] += 1
                 self.shots[score_idx] += 1
-                if random.random() < 0.1:  # 10% chance for a corner
+                if r[1] < 0.1:  # 10% chance for a corner
                     self.corners[score_idx] += 1
-                if random.random() < 0.07:  # 7% chance for offside
+                if r[2] < 0.07:  # 7% chance for offside
                     self.offsides[score_idx] += 1
                 if self._calculate_action_success(attacking_team, defending_team, "shot"):
                     self.score[score_idx] += 1
                     self.shots_on_target[score_idx] += 1
                     
                     # Find scorer and assister
-                    attacking_lineup = self.home_lineup if attacking_team == self.home_team else self.away_lineup
-                    sent_off = self.home_players_sent_off if attacking_team == self.home_team else self.away_players_sent_off
-                    
-                    active_players = [p for p in attacking_lineup if p not in sent_off]
-                    
-                    forwards = [p for p in active_players if p.position in ["ST", "CF", "SS"]]
-                    midfielders = [p for p in active_players if p.position in ["CM", "CAM", "LM", "RM", "LW", "RW"]]
+                    active_players = self._active[score_idx]
+                    forwards = self._strikers[score_idx]
+                    midfielders = self._goal_midfielders[score_idx]
                     
-                    if forwards:
-                        scorer = random.choice(forwards)
-                    elif midfielders:
-                        scorer = random.choice(midfielders)
-                    else:
-                        scorer = random.choice(active_players) if active_players else None
+                    candidates = forwards or midfielders or active_players
+                    scorer = candidates[int(r[6] * len(candidates))] if candidates else None
                     
                     if scorer:
                         scorer.stats["goals"] += 1
                         
                         # Potential assist
                         potential_assisters = [p for p in active_players if p != scorer]
-                        if potential_assisters and random.random() < 0.6:
-                            assister = random.choice(potential_assisters)
+                        if potential_assisters and r[3] < 0.6:
+                            assister = potential_assisters[int(r[7] * len(potential_assisters))]
                             assister.stats["assists"] += 1
                             event_details = f"Goal! {scorer.name} scores! Assisted by {assister.name}."
                         else:
                             event_details = f"Goal! {scorer.name} scores!"
                         
-                        self.events.append(MatchEvent(
+                        self._log_event(
                             self.minute,
                             "goal",
                             scorer.name,
-                            "home" if attacking_team == self.home_team else "away",
+                            "home" if attacking_team is self.home_team else "away",
                             event_details
-                        ))
+                        )
                 
                 # Switch possession after attack
-                if random.random() < 0.65:
-                    self.current_possession = "away" if self.current_possession == "home" else "home"
+                if r[4] < 0.65:
+                    self.possession_idx ^= 1
             else:
                 # Failed attack, possession changes
-                self.fouls[score_idx] += 1 if random.random() < 0.15 else 0  # 15% chance for foul
-                self.current_possession = "away" if self.current_possession == "home" else "home"
+                self.fouls[score_idx] += 1 if r[5] < 0.15 else 0  # 15% chance for foul
+                self.possession_idx ^= 1
                 
         elif action == "midfield":
             # Midfield battle
             if self._calculate_action_success(attacking_team, defending_team, "pass"):
                 # Successful buildup
-                if random.random() < 0.3:  # 30% chance to lose possession anyway
-                    self.current_possession = "away" if self.current_possession == "home" else "home"
+                if r[4] < 0.3:  # 30% chance to lose possession anyway
+                    self.possession_idx ^= 1
             else:
                 # Lost possession
-                self.current_possession = "away" if self.current_possession == "home" else "home"
+                self.possession_idx ^= 1
                 
         elif action == "defense":
             # Defensive action - attempt to win ball back
             if self._calculate_action_success(defending_team, attacking_team, "tackle"):
                 # Successful tackle, defending team gets possession
-                self.current_possession = "away" if self.current_possession == "home" else "home"
+                self.possession_idx ^= 1
         
         # Update possession stats
-        if self.current_possession == "home":
-            self.possession[0] += 1
-        else:
-            self.possession[1] += 1
-        
-        # Update player fatigue and apply age decline
-        for team in [self.home_team, self.away_team]:
-            lineup = self.home_lineup if team == self.home_team else self.away_lineup
-            for player in lineup:
-                # Reduced fatigue per minute for realism
-                fatigue = random.uniform(0.02, 0.05) * self.intensity
-                player.stats["fitness"] = max(0, player.stats["fitness"] - fatigue)
+        self.possession[self.possession_idx] += 1
+        
+        # Update player fatigue and apply age decline (players on the pitch only)
+        # Reduced fatigue per minute for realism, pre-sampled for every lineup slot (home slots first)
+        fatigues = iter(next(self._fatigue_rolls))
+        injury_rolls = iter(next(self._injury_rolls))
+        maybe_injure_player = self._maybe_injure_player
+        for side, lineup in enumerate((self.home_lineup, self.away_lineup)):
+            for player, fatigue, injury_roll in zip(lineup, fatigues, injury_rolls):
+                stats = player.stats
+                stats["fitness"] = max(0, stats["fitness"] - fatigue)
 
                 # Injury check (only for active players)
-                self._maybe_injure_player(player)
-                
-                # Apply age decline (very gradually during matches)
-                if random.random() < 0.001:  # Very rare during individual matches
-                    player.apply_age_decline()
+                maybe_injure_player(player, side, injury_roll)
+        
+        # Apply age decline (very gradually during matches, pre-drawn in play_match)
+        for side, slot in self._age_decline_schedule.get(self.minute, ()):
+            player = (self.home_lineup, self.away_lineup)[side][slot]
+            player.apply_age_decline()
+            self._cache_attributes(player)
+            self._refresh_position_buckets(side == 0)
         
         # Attempt substitutions for both teams
-        if self.minute > 45 and random.random() < 0.1:  # 10% chance per minute after halftime
+        if self.minute > 45 and r[16] < 0.1:  # 10% chance per minute after halftime
             self._attempt_substitution(self.home_team, self.minute)
             self._attempt_substitution(self.away_team, self.minute)
         
@@ -661,6 +687,13 @@ class Match:
         Returns:
             dict: Match statistics and events
         """
+        # Availability and attributes are fixed until kick-off, so look them up once per squad player
+        for player in self.home_team.players + self.away_team.players:
+            available = player.is_available_for_selection()
+            self._available[id(player)] = available
+            if available:
+                self._cache_attributes(player)
+        
         # Select lineups using improved selection
         if self.home_team.manager:
             self.home_lineup, self.home_positions = self.home_team.manager.select_lineup(
@@ -679,62 +712,87 @@ class Match:
             self.away_lineup, self.away_positions = self._select_default_lineup(self.away_team)
 
         # Create bench (remaining players)
-        self.home_bench = [p for p in self.home_team.players if p not in self.home_lineup and p.is_available_for_selection()]
-        self.away_bench = [p for p in self.away_team.players if p not in self.away_lineup and p.is_available_for_selection()]
+        available = self._available
+        home_ids = frozenset(map(id, self.home_lineup))
+        away_ids = frozenset(map(id, self.away_lineup))
+        self.home_bench = [p for p in self.home_team.players if id(p) not in home_ids and available[id(p)]]
+        self.away_bench = [p for p in self.away_team.players if id(p) not in away_ids and available[id(p)]]
 
         # Validate lineups
         self.home_lineup, self.home_positions = self._validate_lineup(self.home_lineup, self.home_positions, self.home_team)
         self.away_lineup, self.away_positions = self._validate_lineup(self.away_lineup, self.away_positions, self.away_team)
+        self._refresh_position_buckets(True)
+        self._refresh_position_buckets(False)
         
         # Simulate 90 minutes + injury time
         injury_time = random.randint(1, 5)
         total_minutes = 90 + injury_time
+        self._draw_match_rolls(total_minutes)
+        self._schedule_age_decline(total_minutes)
         
-        for minute in range(total_minutes):
-            self.simulate_minute()
+        simulate_minute = self.simulate_minute
+        for _ in range(total_minutes):
+            simulate_minute()
             
         # Update player appearances and minutes
-        for player in self.home_lineup:
-            player.stats["appearances"] += 1
-            player.stats["minutes_played"] += total_minutes
-        for player in self.away_lineup:
-            player.stats["appearances"] += 1
-            player.stats["minutes_played"] += total_minutes
-            
-        # Post-match fitness recovery
-        for team in [self.home_team, self.away_team]:
-            for player in team.players:
-                # Recovery based on whether they played
-                if player in self.home_lineup or player in self.away_lineup:
-                    recovery = random.randint(20, 40)  # Starters recover less
-                else:
-                    recovery = random.randint(40, 60)  # Bench players recover more
-                
-                player.stats["fitness"] = min(100, player.stats["fitness"] + recovery)
-                
-                # Process injury recovery
-                player.recover_from_injury(1)
+        for player in chain(self.home_lineup, self.away_lineup):
+            stats = player.stats
+            stats["appearances"] += 1
+            stats["minutes_played"] += total_minutes
+            
+        # Post-match fitness recovery (final lineups, after substitutions)
+        home_ids = frozenset(map(id, self.home_lineup))
+        away_ids = frozenset(map(id, self.away_lineup))
+        lineup_ids = home_ids | away_ids
+        squads = self.home_team.players + self.away_team.players
+        # One 20-40 draw for everyone; players who didn't feature get 20 on top (40-60)
+        recoveries = self._rng.integers(20, 41, size=len(squads)).tolist()
+        for player, recovery in zip(squads, recoveries):
+            # Recovery based on whether they played
+            if id(player) not in lineup_ids:
+                recovery += 20  # Bench players recover more
+            
+            stats = player.stats
+            stats["fitness"] = min(100, stats["fitness"] + recovery)
+            
+            # Process injury recovery
+            player.recover_from_injury(1)
         
         # Calculate match ratings for form updates
-        for player in self.home_lineup + self.away_lineup:
+        home_performance = 0.7 if self.score[0] >= self.score[1] else 0.4
+        away_performance = 0.7 if self.score[1] >= self.score[0] else 0.4
+        rated_players = chain(((p, home_performance) for p in self.home_lineup),
+                              ((p, away_performance) for p in self.away_lineup))
+        individual_performances = self._rng.uniform(
+            0.3, 0.9, len(self.home_lineup) + len(self.away_lineup)
+        ).tolist()
+        for (player, team_performance), individual_performance in zip(rated_players, individual_performances):
             # Base rating influenced by team performance and individual contributions
-            team_performance = 0.7 if (player in self.home_lineup and self.score[0] >= self.score[1]) or \
-                                   (player in self.away_lineup and self.score[1] >= self.score[0]) else 0.4
-            
-            individual_performance = random.uniform(0.3, 0.9)
             fitness_factor = player.stats["fitness"] / 100
             
             match_rating = (team_performance + individual_performance) * fitness_factor
             player.update_form(match_rating)
         
-        from datetime import datetime
+        # Card totals per side in a single pass; injuries are tallied as they happen
+        cards = [[0, 0], [0, 0]]  # [home, away] x [yellows, reds]
+        for side, lineup in enumerate((self.home_lineup, self.away_lineup)):
+            side_cards = cards[side]
+            for player in lineup:
+                stats = player.stats
+                side_cards[0] += stats["yellow_cards"]
+                side_cards[1] += stats["red_cards"]
+        
+        injuries = self._injury_counts
+        
+        possession_scale = 100 / total_minutes  # Minutes on the ball -> percentage
+        
         # Enhanced match summary
         summary = {
             "date": datetime.now().isoformat(),
             "home_team_id": self.home_team.team_id,
             "away_team_id": self.away_team.team_id,
             "score": self.score,
-            "possession": [p/total_minutes*100 for p in self.possession],
+            "possession": [p * possession_scale for p in self.possession],
             "shots": self.shots,
             "shots_on_target": self.shots_on_target,
             "passes_attempted": self.passes_attempted,
@@ -746,12 +804,12 @@ class Match:
             "events": self.events,
             "substitutions": self.substitutions,
             "cards": {
-                "home_yellows": sum(p.stats["yellow_cards"] for p in self.home_lineup),
-                "away_yellows": sum(p.stats["yellow_cards"] for p in self.away_lineup),
-                "home_reds": sum(p.stats["red_cards"] for p in self.home_lineup),
-                "away_reds": sum(p.stats["red_cards"] for p in self.away_lineup)
+                "home_yellows": cards[0][0],
+                "away_yellows": cards[1][0],
+                "home_reds": cards[0][1],
+                "away_reds": cards[1][1]
             },
-            "injuries": len([e for e in self.events if e.type == "injury"]),
+            "injuries": injuries[0] + injuries[1],
             "total_minutes": total_minutes
         }
         
@@ -765,8 +823,8 @@ class Match:
                 "possession": self.possession[0],
                 "shots": self.shots[0],
                 "shots_on_target": self.shots_on_target[0],
-                "cards": summary["cards"]["home_yellows"] + summary["cards"]["home_reds"],
-                "injuries": len([e for e in self.events if e.type == "injury" and e.team == "home"]),
+                "cards": cards[0][0] + cards[0][1],
+                "injuries": injuries[0],
                 "substitutions_used": self.home_substitutions_made,
                 "youth_minutes": self._calculate_youth_minutes(self.home_lineup),
                 "player_development": self._calculate_player_development(self.home_lineup),
@@ -784,8 +842,8 @@ class Match:
                 "possession": self.possession[1],
                 "shots": self.shots[1],
                 "shots_on_target": self.shots_on_target[1],
-                "cards": summary["cards"]["away_yellows"] + summary["cards"]["away_reds"],
-                "injuries": len([e for e in self.events if e.type == "injury" and e.team == "away"]),
+                "cards": cards[1][0] + cards[1][1],
+                "injuries": injuries[1],
                 "substitutions_used": self.away_substitutions_made,
                 "youth_minutes": self._calculate_youth_minutes(self.away_lineup),
                 "player_development": self._calculate_player_development(self.away_lineup),
@@ -798,19 +856,19 @@ class Match:
 
     def _calculate_youth_minutes(self, lineup: List[Any]) -> float:
         """Calculate total minutes played by youth players (under 23)."""
-        return sum(90 for player in lineup if player.age < 23)
+        return 90 * sum(1 for player in lineup if player.age < 23)
 
     def _calculate_player_development(self, lineup: List[Any]) -> float:
         """Calculate average development potential for squad."""
         if not lineup:
             return 0.0
         
-        total_potential = 0
-        for player in lineup:
-            current = player.get_overall_rating()
-            potential = player.potential
-            room_for_growth = (potential - current) / potential if potential > 0 else 0
-            total_potential += room_for_growth
+        # Room for growth per player, using the overall ratings cached for the match
+        attr_cache = self._attr_cache
+        total_potential = sum(
+            (player.potential - attr_cache[id(player)][OVERALL]) / player.potential
+            for player in lineup if player.potential > 0
+        )
             
         return total_potential / len(lineup)
 
@@ -835,29 +893,30 @@ class Match:
         if not team.manager:
             return 0.5
             
-        lineup = self.home_lineup if team == self.home_team else self.away_lineup
-        positions = self.home_positions if team == self.home_team else self.away_positions
+        lineup = self.home_lineup if team is self.home_team else self.away_lineup
+        positions = self.home_positions if team is self.home_team else self.away_positions
         
-        # Calculate average position suitability
-        total_suitability = 0
-        for player, position in zip(lineup, positions):
-            suitability = self._calculate_position_penalty(player, position)
-            total_suitability += suitability
-            
-        return total_suitability / len(lineup) if lineup else 0
+        # Average position suitability depends only on natural vs assigned positions
+        return _formation_suitability(tuple(p.position for p in lineup), tuple(positions))
 
     def _select_default_lineup(self, team: Any) -> Tuple[List[Any], List[str]]:
         """Select a default lineup when no manager is present, considering injuries and fitness."""
-        available_players = [p for p in team.players if p.is_available_for_selection()]
-        
-        goalkeepers = [p for p in available_players if p.position == "GK"]
-        defenders = [p for p in available_players if p.position in ["CB", "LB", "RB", "SW", "LWB", "RWB"]]
-        midfielders = [p for p in available_players if p.position in ["CM", "CDM", "CAM", "LM", "RM", "DM"]]
-        forwards = [p for p in available_players if p.position in ["ST", "CF", "SS", "LW", "RW"]]
-        
-        # Sort by overall rating and fitness
-        for group in [goalkeepers, defenders, midfielders, forwards]:
-            group.sort(key=lambda p: p.get_overall_rating() * (p.stats["fitness"]/100), reverse=True)
+        available = self._available
+        available_players = [p for p in team.players if available[id(p)]]
+        
+        # Bucket by position group in one pass; unrecognised positions fall into _OTHER and are unused
+        groups = ([], [], [], [], [])
+        for p in available_players:
+            groups[_POSITION_GROUP.get(p.position, _OTHER)].append(p)
+        goalkeepers, defenders, midfielders, forwards = groups[_GK], groups[_DEF], groups[_MID], groups[_FWD]
+        
+        # Keep only the best few of each group by overall rating and fitness (4-4-2 needs at most 4)
+        attr_cache = self._attr_cache
+        selection_key = lambda p: attr_cache[id(p)][OVERALL] * (p.stats["fitness"]/100)
+        goalkeepers = heapq.nlargest(1, goalkeepers, key=selection_key)
+        defenders = heapq.nlargest(4, defenders, key=selection_key)
+        midfielders = heapq.nlargest(4, midfielders, key=selection_key)
+        forwards = heapq.nlargest(2, forwards, key=selection_key)
         
         lineup = []
         positions = []
@@ -893,15 +952,16 @@ class Match:
         available_lineup = []
         available_positions = []
         
+        available = self._available
         for player, position in zip(lineup, positions):
-            if player.is_available_for_selection():
+            if available.get(id(player)):
                 available_lineup.append(player)
                 available_positions.append(position)
         
         # Must have at least 1 goalkeeper
         gk_count = sum(1 for pos in available_positions if pos == "GK")
         if gk_count < 1:
-            available_gks = [p for p in team.players if p.position == "GK" and p.is_available_for_selection()]
+            available_gks = [p for p in team.goalkeepers if available.get(id(p))]
             if available_gks:
                 # Replace a non-GK with a GK
                 if available_lineup:
@@ -917,8 +977,9 @@ class Match:
             available_positions = available_positions[:11]
         elif len(available_lineup) < 7:  # FIFA minimum
             # Try to fill with any available players
+            lineup_ids = set(map(id, available_lineup))
             remaining_players = [p for p in team.players 
-                               if p not in available_lineup and p.is_available_for_selection()]
+                               if id(p) not in lineup_ids and available.get(id(p))]
             for player in remaining_players:
                 if len(available_lineup) >= 11:
                     break
@@ -1,19 +1,28 @@
 import sqlite3
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 DB_FILE = "football_sim.db"
+_BULK_CHUNK_SIZE = 500  # Match IDs per IN (...) query in get_match_details_bulk
+_EVENT_ROWS_PER_INSERT = 999 // 6  # MatchEvent rows per multi-row INSERT, under SQLite's default 999 bound parameters
 
 def get_db_connection():
     """Create and return a database connection."""
     return sqlite3.connect(DB_FILE)
 
-def save_match_to_db(match_data: Dict[str, Any], season_year: int, match_number: int):
+def _pair(match_data: Dict[str, Any], key: str):
+    """Return a per-side [home, away] stat from match_data as a tuple, (0, 0) if missing."""
+    value = match_data.get(key)
+    return (value[0], value[1]) if value else (0, 0)
+
+def save_match_to_db(match_data: Dict[str, Any], season_year: int, match_number: int,
+                     conn: Optional[sqlite3.Connection] = None):
     """
     Save a completed match to the database, with validation.
+
+    Pass an open connection as conn to reuse it across a season of saves; the
+    match is still committed on it, but it is left open for the caller to close.
     """
     import logging
-    conn = get_db_connection()
-    cursor = conn.cursor()
 
     # Defensive extraction
     def get_team_id(val):
@@ -38,6 +47,11 @@ def save_match_to_db(match_data: Dict[str, Any], season_year: int, match_number:
         logging.warning(f"Skipping match: missing/invalid team ids in match_data: {match_data}")
         return None
 
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_db_connection()
+    cursor = conn.cursor()
+
     try:
         cursor.execute("""
             INSERT INTO Match (
@@ -58,53 +72,48 @@ def save_match_to_db(match_data: Dict[str, Any], season_year: int, match_number:
             away_team_id,
             score[0],
             score[1],
-            match_data.get("possession", [0, 0])[0],
-            match_data.get("possession", [0, 0])[1],
+            *_pair(match_data, "possession"),
             match_data.get("weather"),
             match_data.get("intensity", "normal"),
-            match_data.get("passes_attempted", [0, 0])[0],
-            match_data.get("passes_attempted", [0, 0])[1],
-            match_data.get("passes_completed", [0, 0])[0],
-            match_data.get("passes_completed", [0, 0])[1],
-            match_data.get("fouls", [0, 0])[0],
-            match_data.get("fouls", [0, 0])[1],
-            match_data.get("corners", [0, 0])[0],
-            match_data.get("corners", [0, 0])[1],
-            match_data.get("offsides", [0, 0])[0],
-            match_data.get("offsides", [0, 0])[1]
+            *_pair(match_data, "passes_attempted"),
+            *_pair(match_data, "passes_completed"),
+            *_pair(match_data, "fouls"),
+            *_pair(match_data, "corners"),
+            *_pair(match_data, "offsides")
         ))
         match_id = cursor.lastrowid
 
         # 2. Insert into MatchShots table
-        cursor.execute("""
+        shots = match_data["shots"]
+        shots_on_target = match_data["shots_on_target"]
+        cursor.executemany("""
             INSERT INTO MatchShots (match_id, team, total, on_target)
-            VALUES (?, 'home', ?, ?)
-        """, (match_id, match_data["shots"][0], match_data["shots_on_target"][0]))
-        
-        cursor.execute("""
-            INSERT INTO MatchShots (match_id, team, total, on_target)
-            VALUES (?, 'away', ?, ?)
-        """, (match_id, match_data["shots"][1], match_data["shots_on_target"][1]))
-
-        # 3. Insert into MatchEvent table
-        for event in match_data.get("events", []):
-            if isinstance(event, str):
-                cursor.execute("""
-                    INSERT INTO MatchEvent (match_id, minute, type, details)
-                    VALUES (?, ?, ?, ?)
-                """, (match_id, 0, 'forfeit', event))
-            else:
-                cursor.execute("""
-                    INSERT INTO MatchEvent (match_id, minute, type, player, team, details)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    match_id,
-                    event.minute,
-                    event.type,
-                    event.player,
-                    event.team,
-                    event.details
-                ))
+            VALUES (?, ?, ?, ?)
+        """, [
+            (match_id, 'home', shots[0], shots_on_target[0]),
+            (match_id, 'away', shots[1], shots_on_target[1])
+        ])
+
+        # 3. Insert into MatchEvent table (forfeits are logged as plain strings)
+        # Events go in as one multi-row INSERT per chunk rather than one bind per row
+        events = match_data.get("events", [])
+        event_values = [
+            value
+            for event in events if not isinstance(event, str)
+            for value in (match_id, event.minute, event.type, event.player, event.team, event.details)
+        ]
+        chunk_size = _EVENT_ROWS_PER_INSERT * 6
+        for start in range(0, len(event_values), chunk_size):
+            chunk = event_values[start:start + chunk_size]
+            placeholders = ", ".join(["(?, ?, ?, ?, ?, ?)"] * (len(chunk) // 6))
+            cursor.execute(f"""
+                INSERT INTO MatchEvent (match_id, minute, type, player, team, details)
+                VALUES {placeholders}
+            """, chunk)
+        cursor.executemany("""
+            INSERT INTO MatchEvent (match_id, minute, type, details)
+            VALUES (?, ?, ?, ?)
+        """, [(match_id, 0, 'forfeit', event) for event in events if isinstance(event, str)])
             
         # 4. Insert lineups and formations (assuming new tables)
         # This part will require schema changes to be implemented first
@@ -124,7 +133,8 @@ def save_match_to_db(match_data: Dict[str, Any], season_year: int, match_number:
         conn.rollback()
         return None
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 def get_matches_for_season(season_year: int) -> List[Dict[str, Any]]:
     """
@@ -169,35 +179,57 @@ def get_match_details(match_id: int) -> Dict[str, Any]:
     Returns:
         A dictionary containing all details of the match.
     """
+    return get_match_details_bulk([match_id]).get(match_id)
+
+def get_match_details_bulk(match_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Retrieve full details for many matches with one query per table.
+    
+    Args:
+        match_ids (List[int]): The IDs of the matches to retrieve.
+        
+    Returns:
+        A dictionary mapping each found match ID to its details, in the same
+        shape get_match_details returns. Missing IDs are left out.
+    """
     conn = get_db_connection()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
-    match_details = {}
+    all_details = {}
     
     try:
-        # Get main match data
-        cursor.execute("""
-            SELECT m.*, ht.name as home_team_name, at.name as away_team_name
-            FROM Match m
-            JOIN Team ht ON m.home_team_id = ht.team_id
-            JOIN Team at ON m.away_team_id = at.team_id
-            WHERE m.match_id = ?
-        """, (match_id,))
-        match_info = cursor.fetchone()
-        if not match_info:
-            return None
-        match_details.update(dict(match_info))
-        
-        # Get shots data
-        cursor.execute("SELECT * FROM MatchShots WHERE match_id = ?", (match_id,))
-        shots_data = cursor.fetchall()
-        match_details["shots"] = {row["team"]: {"total": row["total"], "on_target": row["on_target"]} for row in shots_data}
-        
-        # Get events data
-        cursor.execute("SELECT * FROM MatchEvent WHERE match_id = ? ORDER BY minute", (match_id,))
-        events_data = cursor.fetchall()
-        match_details["events"] = [dict(row) for row in events_data]
+        # Keep each IN (...) list under SQLite's default bound-parameter limit
+        for start in range(0, len(match_ids), _BULK_CHUNK_SIZE):
+            chunk = match_ids[start:start + _BULK_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            
+            # Get main match data
+            cursor.execute(f"""
+                SELECT m.*, ht.name as home_team_name, at.name as away_team_name
+                FROM Match m
+                JOIN Team ht ON m.home_team_id = ht.team_id
+                JOIN Team at ON m.away_team_id = at.team_id
+                WHERE m.match_id IN ({placeholders})
+            """, chunk)
+            for row in cursor.fetchall():
+                all_details[row["match_id"]] = {**dict(row), "shots": {}, "events": []}
+            
+            # Get shots data
+            cursor.execute(f"SELECT * FROM MatchShots WHERE match_id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                details = all_details.get(row["match_id"])
+                if details is not None:
+                    details["shots"][row["team"]] = {"total": row["total"], "on_target": row["on_target"]}
+            
+            # Get events data
+            cursor.execute(f"""
+                SELECT * FROM MatchEvent WHERE match_id IN ({placeholders}) ORDER BY match_id, minute
+            """, chunk)
+            for row in cursor.fetchall():
+                details = all_details.get(row["match_id"])
+                if details is not None:
+                    details["events"].append(dict(row))
         
         # Get lineup data (from placeholder tables)
         # This will need to be updated once the schema is finalized
@@ -205,10 +237,10 @@ def get_match_details(match_id: int) -> Dict[str, Any]:
         # lineup_data = cursor.fetchall()
         # match_details["lineups"] = [dict(row) for row in lineup_data]
         
-        return match_details
+        return all_details
         
     except sqlite3.Error as e:
         print(f"Database error: {e}")
-        return None
+        return {}
     finally:
         conn.close()
@@ -1,10 +1,92 @@
 import random
+import numpy as np
 import names  # Requires: pip install names
 from player_db import create_player, get_player, update_player, delete_player
 
 import sqlite3
 
+# Attribute development factor used by apply_age_decline, indexed by age.
+# Ages past the end of the table share the last (oldest) entry.
+_AGE_DEVELOPMENT_FACTOR = tuple(
+    1.02 if age < 23 else       # Young players still developing
+    1.001 if age <= 27 else     # Peak years - maintain or slight improvement
+    1.0 if age <= 29 else       # Peak maintained
+    0.998 if age <= 32 else     # Gradual decline
+    0.995 if age <= 35 else     # Noticeable decline
+    0.99                        # Significant decline after 35
+    for age in range(37)
+)
+
+# (category, sub-attribute) pairs in the order FootballPlayer.attributes lists them
+_ATTRIBUTE_KEYS = (
+    ("pace", "acceleration"), ("pace", "sprint_speed"),
+    ("shooting", "finishing"), ("shooting", "shot_power"), ("shooting", "long_shots"),
+    ("passing", "vision"), ("passing", "crossing"), ("passing", "free_kick"),
+    ("dribbling", "agility"), ("dribbling", "balance"), ("dribbling", "ball_control"),
+    ("defending", "marking"), ("defending", "standing_tackle"), ("defending", "sliding_tackle"),
+    ("physical", "strength"), ("physical", "stamina"), ("physical", "aggression"),
+    ("goalkeeping", "diving"), ("goalkeeping", "handling"), ("goalkeeping", "reflexes"),
+    ("goalkeeping", "positioning"),
+)
+
+# Training rates by intensity: (improvement, improvement per unit of coach bonus,
+# minimum fitness cost, fitness cost, fitness cost saved per unit of coach bonus)
+_TRAINING_INTENSITY = {
+    "low": (0.02, 0.01, 0.3, 1.0, 0.2),
+    "medium": (0.04, 0.02, 0.8, 2.0, 0.3),
+    "high": (0.06, 0.03, 1.5, 3.5, 0.5),
+}
+
+# "category.sub_attribute" labels for training results, built once rather than per improvement;
+# attributes loaded from the database may carry other keys, which are formatted on the fly
+_ATTRIBUTE_LABELS = {(category, sub_attr): f"{category}.{sub_attr}" for category, sub_attr in _ATTRIBUTE_KEYS}
+
+def _attribute_draw_bounds(boosts):
+    """
+    Inclusive-low/exclusive-high bounds for create_player's attribute draws.
+    Row 0 is the base value (boosted categories use their own range, the rest 30-65),
+    row 1 the +/-8 variation, so one Generator.integers call draws both.
+    """
+    base = [boosts.get(attr_type, (30, 65)) for attr_type, _ in _ATTRIBUTE_KEYS]
+    low = np.array([[lo for lo, _ in base], [-8] * len(base)])
+    high = np.array([[hi + 1 for _, hi in base], [9] * len(base)])
+    return low, high
+
+# Position pool for create_player when no position is given
+_RANDOM_POSITIONS = (
+    "GK",  # Goalkeeper
+    "CB", "LB", "RB", "LWB", "RWB", "SW",  # Defenders
+    "CDM", "CM", "CAM", "LM", "RM", "DM",  # Midfielders
+    "LW", "RW", "CF", "ST", "SS"  # Forwards
+)
+
+# Position category mapping for attribute generation; anything unlisted is "MID"
+_POSITION_CATEGORY = {
+    **dict.fromkeys(("GK", "GOALKEEPER"), "GK"),
+    **dict.fromkeys(("CB", "LB", "RB", "LWB", "RWB", "SW", "DEFENDER"), "DEF"),
+    **dict.fromkeys(("ST", "CF", "LW", "RW", "SS", "STRIKER", "FORWARD"), "FWD"),
+}
+
+# Attribute ranges by position category
+_ATTRIBUTE_DRAW_BOUNDS = {
+    category: _attribute_draw_bounds(boosts)
+    for category, boosts in {
+        "GK": {"goalkeeping": (40, 85)},
+        "DEF": {"defending": (30, 80), "physical": (35, 85)},
+        "MID": {"passing": (30, 85), "dribbling": (25, 80)},
+        "FWD": {"shooting": (30, 85), "pace": (30, 85)}
+    }.items()
+}
+
 class FootballPlayer:
+    # Squads, youth academies and the transfer pool hold thousands of players over a save
+    __slots__ = (
+        "name", "age", "position", "team", "potential", "wage", "contract_length",
+        "form", "is_injured", "injury_type", "recovery_time", "injury_history",
+        "squad_role", "recently_transferred",
+        "desired_wage", "contract_offer", "negotiation_state", "transfer_interest",
+        "player_id", "attributes", "stats", "contract_history", "peak_rating"
+    )
     
     def __init__(self, name, age, position, potential=70, wage=1000):
         """
@@ -144,47 +226,28 @@ class FootballPlayer:
     
     def apply_age_decline(self):
         """Apply realistic age decline curve (peak at 27-29, decline after 30)"""
-        if self.age < 23:
-            # Young players still developing
-            development_factor = 1.02
-        elif 23 <= self.age <= 27:
-            # Peak years - maintain or slight improvement
-            development_factor = 1.001
-        elif 28 <= self.age <= 29:
-            # Peak maintained
-            development_factor = 1.0
-        elif 30 <= self.age <= 32:
-            # Gradual decline
-            development_factor = 0.998
-        elif 33 <= self.age <= 35:
-            # Noticeable decline
-            development_factor = 0.995
-        else:
-            # Significant decline after 35
-            development_factor = 0.99
+        development_factor = _AGE_DEVELOPMENT_FACTOR[min(self.age, len(_AGE_DEVELOPMENT_FACTOR) - 1)]
         
         # Track peak rating for comparison
         current_rating = self.get_overall_rating()
         if self.peak_rating is None or current_rating > self.peak_rating:
             self.peak_rating = current_rating
         
+        # Physical attributes decline faster
+        physical_factor = development_factor * 0.998 if self.age > 30 else development_factor
+        
         # Apply decline to attributes based on age
-        for attr_type in self.attributes:
-            # Physical attributes decline faster
-            if attr_type in ["pace", "physical"]:
-                decline_factor = development_factor * 0.998 if self.age > 30 else development_factor
-            else:
-                decline_factor = development_factor
-                
-            for sub_attr in self.attributes[attr_type]:
-                old_value = self.attributes[attr_type][sub_attr]
-                new_value = max(1.0, old_value * decline_factor)
-                self.attributes[attr_type][sub_attr] = new_value
+        for attr_type, values in self.attributes.items():
+            decline_factor = physical_factor if attr_type in ("pace", "physical") else development_factor
+            for sub_attr, old_value in values.items():
+                values[sub_attr] = max(1.0, old_value * decline_factor)
     
     def get_overall_rating(self):
         """Calculate overall player rating"""
-        total = sum(sum(cat.values()) for cat in self.attributes.values())
-        count = sum(len(cat) for cat in self.attributes.values())
+        total = count = 0
+        for cat in self.attributes.values():
+            total += sum(cat.values())
+            count += len(cat)
         return total / count if count > 0 else 50
     
     def update_form(self, match_rating):
@@ -302,13 +365,7 @@ class FootballPlayer:
             
         # Generate random position if not provided
         if position is None:
-            positions = [
-                "GK",  # Goalkeeper
-                "CB", "LB", "RB", "LWB", "RWB", "SW",  # Defenders
-                "CDM", "CM", "CAM", "LM", "RM", "DM",  # Midfielders
-                "LW", "RW", "CF", "ST", "SS"  # Forwards
-            ]
-            position = random.choice(positions)
+            position = random.choice(_RANDOM_POSITIONS)
             
         # Generate random potential based on age
         if potential is None:
@@ -337,22 +394,7 @@ class FootballPlayer:
         # Create the player with calculated wage
         player = cls(name, age, position, potential, wage=base_wage * age_modifier)
         
-        # Set attribute ranges based on position
-        position_boosts = {
-            "GK": {"goalkeeping": (40, 85)},
-            "DEF": {"defending": (30, 80), "physical": (35, 85)},
-            "MID": {"passing": (30, 85), "dribbling": (25, 80)},
-            "FWD": {"shooting": (30, 85), "pace": (30, 85)}
-        }
-        
-        # Position category mapping
-        position_category = "MID"  # Default
-        if position.upper() in ["GK", "GOALKEEPER"]:
-            position_category = "GK"
-        elif position.upper() in ("CB", "LB", "RB", "LWB", "RWB", "SW", "DEFENDER"):
-            position_category = "DEF"
-        elif position.upper() in ["ST", "CF", "LW", "RW", "SS", "STRIKER", "FORWARD"]:
-            position_category = "FWD"
+        position_category = _POSITION_CATEGORY.get(position.upper(), "MID")
         
         # Scale attribute generation based on potential and age
         potential_factor = player.potential / 99.0
@@ -367,24 +409,15 @@ class FootballPlayer:
         else:
             ability_factor = 0.9  # Experienced but potentially declining
         
-        # Generate random attributes based on position
-        for attr_type in player.attributes:
-            # Determine the base range
-            if attr_type in position_boosts.get(position_category, {}):
-                min_val, max_val = position_boosts[position_category][attr_type]
-            else:
-                min_val, max_val = 30, 65  # Default range for non-specialized attributes
-            
-            # Set each sub-attribute
-            for sub_attr in player.attributes[attr_type]:
-                # Add some randomness within the range, scaled by potential and age
-                base_value = random.randint(min_val, max_val)
-                variation = random.randint(-8, 8)
-                
-                # Apply potential and age factors
-                final_value = (base_value + variation) * potential_factor * ability_factor
-                final_value = min(95, max(10, final_value))
-                player.attributes[attr_type][sub_attr] = round(final_value, 1)
+        # Generate random attributes based on position: each is a base value from the
+        # position's range plus a variation, scaled by potential and age
+        low, high = _ATTRIBUTE_DRAW_BOUNDS[position_category]
+        rng = np.random.default_rng(random.getrandbits(64))
+        values = rng.integers(low, high).sum(axis=0) * (potential_factor * ability_factor)
+        np.clip(values, 10, 95, out=values)
+        np.round(values, 1, out=values)
+        for (attr_type, sub_attr), value in zip(_ATTRIBUTE_KEYS, values.tolist()):
+            player.attributes[attr_type][sub_attr] = value
         
         return player
 
@@ -401,27 +434,22 @@ class FootballPlayer:
         Returns:
             dict: Summary of training results
         """
+        # Much more realistic improvement rates
+        rates = _TRAINING_INTENSITY.get(intensity)
+        if rates is None:
+            return None
+        rate, rate_per_bonus, min_cost, cost, cost_saving_per_bonus = rates
+        improvement = rate + (coach_bonus * rate_per_bonus)
+        fitness_cost = max(min_cost, cost - coach_bonus * cost_saving_per_bonus)
+        
         results = {
-            "initial_attributes": {k: {sk: v for sk, v in sv.items()} for k, sv in self.attributes.items()},
+            "initial_attributes": {k: dict(sv) for k, sv in self.attributes.items()},
             "training_days": training_days,
             "focused_area": focus_area,
             "fitness_impact": 0,
             "improvements": []
         }
         
-        # Much more realistic improvement rates
-        if intensity == "low":
-            improvement = 0.02 + (coach_bonus * 0.01)
-            fitness_cost = max(0.3, 1.0 - coach_bonus * 0.2)
-        elif intensity == "medium":
-            improvement = 0.04 + (coach_bonus * 0.02)
-            fitness_cost = max(0.8, 2.0 - coach_bonus * 0.3)
-        elif intensity == "high":
-            improvement = 0.06 + (coach_bonus * 0.03)
-            fitness_cost = max(1.5, 3.5 - coach_bonus * 0.5)
-        else:
-            return None
-        
         # Age affects training effectiveness
         age_factor = 1.0
         if self.age < 21:
@@ -435,16 +463,26 @@ class FootballPlayer:
         else:
             age_factor = 0.4
         
+        # Loop invariants: the potential cap, the potential/coach-dependent factors and daily fitness cost
+        potential_limit = min(self.potential, 95)
+        potential_factor = self.potential / 100.0
+        focus_improvement = improvement * 2 * age_factor
+        bonus_chance = 0.02 * (1 + coach_bonus)
+        age_fitness_factor = 1.0 if self.age < 30 else 1.3  # Older players tire faster
+        fitness_loss = fitness_cost * age_fitness_factor
+        stats = self.stats
+        rand, uniform = random.random, random.uniform
+        
         # Apply training over multiple days
         for day in range(training_days):
             # Skip training if player is too tired or injured
-            if self.stats["fitness"] < 20 or self.is_injured:
+            if stats["fitness"] < 20 or self.is_injured:
                 break
             
             # Apply focused improvement if specified
             if focus_area and focus_area in self.attributes:
-                for attribute in self.attributes[focus_area]:
-                    current_val = self.attributes[focus_area][attribute]
+                focus_values = self.attributes[focus_area]
+                for attribute, current_val in focus_values.items():
                     
                     # Harder to improve higher ratings
                     difficulty_factor = 1.0
@@ -454,25 +492,23 @@ class FootballPlayer:
                         difficulty_factor = 0.2
                     
                     # Calculate improvement
-                    actual_improvement = improvement * 2 * age_factor * difficulty_factor
+                    actual_improvement = focus_improvement * difficulty_factor
                     
                     # Don't exceed potential
-                    potential_limit = min(self.potential, 95)
                     if current_val + actual_improvement > potential_limit:
                         actual_improvement = max(0, potential_limit - current_val)
                     
                     if actual_improvement > 0:
-                        self.attributes[focus_area][attribute] += actual_improvement
+                        focus_values[attribute] += actual_improvement
                         results["improvements"].append({
-                            "attribute": f"{focus_area}.{attribute}",
+                            "attribute": _ATTRIBUTE_LABELS.get((focus_area, attribute)) or f"{focus_area}.{attribute}",
                             "improvement": actual_improvement
                         })
             
             # Apply small improvement to all attributes
-            for attr_type in self.attributes:
+            for attr_type, values in self.attributes.items():
                 weight = 0.5 if attr_type != focus_area else 0.2  # Reduced general improvement
-                for sub_attr in self.attributes[attr_type]:
-                    current_val = self.attributes[attr_type][sub_attr]
+                for sub_attr, current_val in values.items():
                     
                     # Difficulty factor
                     difficulty_factor = 1.0
@@ -483,34 +519,30 @@ class FootballPlayer:
                     
                     # Base improvement with age and potential influence
                     base_improvement = improvement * weight * age_factor * difficulty_factor
-                    potential_factor = self.potential / 100.0
                     
                     actual_improvement = base_improvement * potential_factor
                     
                     # Random chance for bonus improvement
-                    if random.random() < 0.02 * (1 + coach_bonus):
-                        bonus = random.uniform(0.005, 0.015) * age_factor
+                    if rand() < bonus_chance:
+                        bonus = uniform(0.005, 0.015) * age_factor
                         actual_improvement += bonus
                     
                     # Don't exceed potential
-                    potential_limit = min(self.potential, 95)
                     if current_val + actual_improvement > potential_limit:
                         actual_improvement = max(0, potential_limit - current_val)
                     
                     if actual_improvement > 0.01:  # Only apply meaningful improvements
-                        self.attributes[attr_type][sub_attr] += actual_improvement
+                        values[sub_attr] += actual_improvement
             
             # Update fitness with age factor
-            age_fitness_factor = 1.0 if self.age < 30 else 1.3  # Older players tire faster
-            fitness_loss = fitness_cost * age_fitness_factor
-            self.stats["fitness"] = max(0, self.stats["fitness"] - fitness_loss)
+            stats["fitness"] = max(0, stats["fitness"] - fitness_loss)
             results["fitness_impact"] += fitness_loss
         
         # Ensure fitness is within bounds
         self.stats["fitness"] = max(0, min(100, self.stats["fitness"]))
         
         # Complete results
-        results["final_attributes"] = {k: {sk: v for sk, sv in self.attributes.items()} for k, sv in self.attributes.items()}
+        results["final_attributes"] = {k: dict(sv) for k, sv in self.attributes.items()}
         
         return results
 
@@ -524,7 +556,15 @@ class FootballPlayer:
         Returns:
             dict: Player's attributes and stats based on requested detail level
         """
-        basic_info = {
+        build_info = self._INFO_BUILDERS.get(detail_level)
+        if build_info is None:
+            print("Invalid detail level. Using 'basic'")
+            build_info = FootballPlayer._info_basic
+        return build_info(self)
+
+    def _info_basic(self):
+        """Player information for get_player_info's 'basic' level"""
+        return {
             "name": self.name,
             "age": self.age,
             "position": self.position,
@@ -539,26 +579,26 @@ class FootballPlayer:
             "recovery_time": self.recovery_time,
             "available": self.is_available_for_selection()
         }
-        
-        if detail_level == "basic":
-            return basic_info
-            
-        elif detail_level == "stats":
-            return {**basic_info, "stats": self.stats, "form": self.get_form_rating()}
-            
-        elif detail_level == "full":
-            return {
-                **basic_info,
-                "stats": self.stats,
-                "attributes": self.attributes,
-                "form": self.form,
-                "injury_history": self.injury_history,
-                "peak_rating": self.peak_rating
-            }
-        
-        else:
-            print("Invalid detail level. Using 'basic'")
-            return basic_info
+
+    def _info_stats(self):
+        """Player information for get_player_info's 'stats' level: basic plus stats and form"""
+        info = self._info_basic()
+        info["stats"] = self.stats
+        info["form"] = self.get_form_rating()
+        return info
+
+    def _info_full(self):
+        """Player information for get_player_info's 'full' level"""
+        info = self._info_basic()
+        info["stats"] = self.stats
+        info["attributes"] = self.attributes
+        info["form"] = self.form
+        info["injury_history"] = self.injury_history
+        info["peak_rating"] = self.peak_rating
+        return info
+
+    # get_player_info detail levels
+    _INFO_BUILDERS = {"basic": _info_basic, "stats": _info_stats, "full": _info_full}
 
 if __name__ == "__main__":
     player = FootballPlayer.create_player()
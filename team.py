@@ -39,6 +39,7 @@ class Team:
         self.expense_history = []
         
         self.players = []
+        self.goalkeepers = []  # Subset of players with position "GK", kept in step by the roster methods
         self.manager = None
         self.coaches = []
         self.squad_roles_requirements = {
@@ -423,12 +424,16 @@ class Team:
             raise ValueError("Adding player would exceed wage budget")
         
         self.players.append(player)
+        if player.position == "GK":
+            self.goalkeepers.append(player)
         player.team = self.name
 
     def remove_player(self, player):
         """Remove a player from the team."""
         if player in self.players:
             self.players.remove(player)
+            if player in self.goalkeepers:
+                self.goalkeepers.remove(player)
             player.team = None
 
     def set_manager(self, manager):
@@ -523,6 +528,8 @@ class Team:
         if is_selling:
             if player in self.players:
                 self.players.remove(player)
+                if player in self.goalkeepers:
+                    self.goalkeepers.remove(player)
                 
                 # Add transfer fee to budget
                 self.budget += fee
@@ -559,6 +566,8 @@ class Team:
             
             # Process purchase
             self.players.append(player)
+            if player.position == "GK":
+                self.goalkeepers.append(player)
             self.budget -= fee
             self.transfer_budget -= fee
             
@@ -0,0 +1,116 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import match_db
+from db_setup import create_tables
+from match import MatchEvent
+
+
+def _old_match_details(db_file, match_id):
+    """The single-match queries get_match_details ran before it delegated to the bulk lookup."""
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT m.*, ht.name as home_team_name, at.name as away_team_name
+            FROM Match m
+            JOIN Team ht ON m.home_team_id = ht.team_id
+            JOIN Team at ON m.away_team_id = at.team_id
+            WHERE m.match_id = ?
+        """, (match_id,))
+        match_info = cursor.fetchone()
+        if not match_info:
+            return None
+        match_details = dict(match_info)
+        cursor.execute("SELECT * FROM MatchShots WHERE match_id = ?", (match_id,))
+        match_details["shots"] = {row["team"]: {"total": row["total"], "on_target": row["on_target"]}
+                                  for row in cursor.fetchall()}
+        cursor.execute("SELECT * FROM MatchEvent WHERE match_id = ? ORDER BY minute", (match_id,))
+        match_details["events"] = [dict(row) for row in cursor.fetchall()]
+        return match_details
+    finally:
+        conn.close()
+
+
+class TestMatchDetailsBulk(unittest.TestCase):
+    def setUp(self):
+        fd, self.db_file = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        create_tables(self.db_file)
+        conn = sqlite3.connect(self.db_file)
+        conn.executemany(
+            "INSERT INTO Team (team_id, name, budget, weekly_budget, transfer_budget, wage_budget) "
+            "VALUES (?, ?, 1000000, 10000, 500000, 20000)",
+            [(1, "Home FC"), (2, "Away United")]
+        )
+        conn.commit()
+        conn.close()
+
+        patcher = mock.patch.object(match_db, "DB_FILE", self.db_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.match_ids = [self._save_match(n) for n in range(1, 6)]
+
+    def tearDown(self):
+        os.remove(self.db_file)
+
+    def _save_match(self, match_number):
+        match_data = {
+            "date": f"2025-08-{match_number:02d}",
+            "score": [match_number % 3, 1],
+            "home_team_id": 1,
+            "away_team_id": 2,
+            "possession": [55.0, 45.0],
+            "weather": "sunny",
+            "shots": [10 + match_number, 7],
+            "shots_on_target": [4, 3],
+            "events": [
+                MatchEvent(12, "goal", f"Striker {match_number}", "home", "Header"),
+                MatchEvent(40, "yellow_card", "Defender", "away", "Late tackle"),
+                MatchEvent(77, "goal", "Winger", "away", ""),
+            ],
+        }
+        match_id = match_db.save_match_to_db(match_data, 2025, match_number)
+        self.assertIsNotNone(match_id)
+        return match_id
+
+    def test_request_larger_than_one_chunk(self):
+        """Ids spread over several IN (...) chunks all come back, each with its own shots and events"""
+        with mock.patch.object(match_db, "_BULK_CHUNK_SIZE", 2):
+            details = match_db.get_match_details_bulk(self.match_ids)
+
+        self.assertEqual(sorted(details), sorted(self.match_ids))
+        for number, match_id in enumerate(self.match_ids, start=1):
+            self.assertEqual(details[match_id]["match_number"], number)
+            self.assertEqual(details[match_id]["shots"]["home"]["total"], 10 + number)
+            self.assertEqual([e["minute"] for e in details[match_id]["events"]], [12, 40, 77])
+            self.assertEqual(details[match_id]["events"][0]["player"], f"Striker {number}")
+
+    def test_missing_ids_are_left_out(self):
+        missing_id = max(self.match_ids) + 100
+        details = match_db.get_match_details_bulk([self.match_ids[0], missing_id])
+
+        self.assertEqual(list(details), [self.match_ids[0]])
+        self.assertIsNone(match_db.get_match_details(missing_id))
+        self.assertEqual(match_db.get_match_details_bulk([]), {})
+
+    def test_single_match_parity_with_old_lookup(self):
+        for match_id in self.match_ids:
+            self.assertEqual(match_db.get_match_details(match_id), _old_match_details(self.db_file, match_id))
+
+    def test_database_error_returns_empty(self):
+        fd, empty_db = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.addCleanup(os.remove, empty_db)
+        with mock.patch.object(match_db, "DB_FILE", empty_db), mock.patch("builtins.print"):
+            self.assertEqual(match_db.get_match_details_bulk(self.match_ids), {})
+            self.assertIsNone(match_db.get_match_details(self.match_ids[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
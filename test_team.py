@@ -0,0 +1,41 @@
+import unittest
+from team import Team
+from player import FootballPlayer
+
+class TestTeamGoalkeepers(unittest.TestCase):
+    def setUp(self):
+        self.team = Team("Keeper Town", budget=300_000_000)
+        self.first_keeper = FootballPlayer("First Keeper", 28, "GK", wage=5000)
+        self.second_keeper = FootballPlayer("Second Keeper", 24, "GK", wage=3000)
+        self.defender = FootballPlayer("Centre Back", 26, "CB", wage=4000)
+
+    def test_goalkeepers_follow_roster_changes(self):
+        """Team.goalkeepers tracks GKs through add, remove, sale and purchase"""
+        # Add: only goalkeepers join the list
+        self.team.add_player(self.first_keeper, force=True)
+        self.team.add_player(self.defender, force=True)
+        self.team.add_player(self.second_keeper, force=True)
+        self.assertEqual(self.team.goalkeepers, [self.first_keeper, self.second_keeper])
+
+        # Remove
+        self.team.remove_player(self.first_keeper)
+        self.assertEqual(self.team.goalkeepers, [self.second_keeper])
+
+        # Sale
+        self.assertTrue(self.team.handle_transfer(self.second_keeper, 1_000_000, is_selling=True))
+        self.assertEqual(self.team.goalkeepers, [])
+
+        # Purchase
+        self.assertTrue(self.team.handle_transfer(self.first_keeper, 1_000_000, is_selling=False))
+        self.assertEqual(self.team.goalkeepers, [self.first_keeper])
+
+        self.assertEqual(self.team.goalkeepers, [p for p in self.team.players if p.position == "GK"])
+
+    def test_rejected_purchase_leaves_goalkeepers_unchanged(self):
+        self.team.add_player(self.first_keeper, force=True)
+        fee = self.team.transfer_budget + 1
+        self.assertFalse(self.team.handle_transfer(self.second_keeper, fee, is_selling=False))
+        self.assertEqual(self.team.goalkeepers, [self.first_keeper])
+
+if __name__ == "__main__":
+    unittest.main()
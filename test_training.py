@@ -26,6 +26,23 @@ def test_training():
     
     print("\n=== Training Test Complete ===")
 
+def test_training_extra_sub_attribute():
+    """Attributes loaded from the database may carry sub-attributes outside the standard set"""
+    player = FootballPlayer("Loaded Player", 22, "ST", potential=90)
+    player.attributes["shooting"]["volleys"] = 40.0
+
+    results = player.train_player(
+        intensity="high",
+        focus_area="shooting",
+        training_days=2
+    )
+
+    labels = [imp["attribute"] for imp in results["improvements"]]
+    assert "shooting.volleys" in labels
+    assert "shooting.finishing" in labels
+    assert player.attributes["shooting"]["volleys"] > 40.0
+    assert results["final_attributes"]["shooting"]["volleys"] == player.attributes["shooting"]["volleys"]
+
 if __name__ == "__main__":
     test_players = [
         FootballPlayer.create_player(position="GK"),